@@ -1,5 +1,5 @@
 import json
-import math
+import numpy as np
 
 def deg_to_rad_layout(input_file, output_file=None):
     with open(input_file, "r") as f:
@@ -9,11 +9,15 @@ def deg_to_rad_layout(input_file, output_file=None):
         print("❌ Expected a list of LED objects.")
         return
 
-    for led in data:
-        if "theta" in led and "phi" in led:
-            # Convert from degrees to radians
-            led["theta"] = math.radians(led["theta"])
-            led["phi"] = math.radians(led["phi"])
+    leds = [led for led in data if "theta" in led and "phi" in led]
+
+    # Convert from degrees to radians for all LEDs at once
+    theta = np.deg2rad(np.fromiter((led["theta"] for led in leds), dtype=np.float64, count=len(leds)))
+    phi = np.deg2rad(np.fromiter((led["phi"] for led in leds), dtype=np.float64, count=len(leds)))
+
+    for led, t, p in zip(leds, theta.tolist(), phi.tolist()):
+        led["theta"] = t
+        led["phi"] = p
 
     out_file = output_file or input_file
     with open(out_file, "w") as f:
@@ -1,41 +1,72 @@
 import openai
 import re
 import json
+from collections import OrderedDict
+
+CACHE_SIZE = 64  # recent answers kept in memory
+
+# Static instructions go first and never change, so OpenAI can reuse the cached prefix
+SYSTEM_PROMPT = (
+    "You are a voice assistant. Your task is to answer user questions about places or regions.\n"
+    "Always return your response in exactly this format:\n\n"
+    "Location JSON:\n"
+    "```json\n"
+    "{\n  \"type\": \"point\", \"lat\": ..., \"lon\": ..., \"color_rgb\": [R, G, B]\n}\n"
+    "or\n"
+    "{\n  \"type\": \"region\", \"polygon\": [[lat1, lon1], ...], \"color_rgb\": [R, G, B]\n}\n"
+    "```\n\n"
+    "Answer:\n"
+    "(write a short, friendly spoken response that includes weather if available)"
+)
+
+LOCATION_JSON_RE = re.compile(r"Location JSON:\s*```json\s*(\{.*?\})\s*```", re.DOTALL)
+ANSWER_RE = re.compile(r"Answer:\s*(.+)", re.DOTALL)
+# A sentence ends at . ! or ? (plus any closing quote or bracket) followed by
+# the start of another sentence
+SENTENCE_END = re.compile(r"[.!?][\"')]?(?=\s+[A-Z\"'(])")
+# Words whose trailing period doesn't end a sentence ("Mt. Everest", "St. Louis")
+ABBREVIATIONS = {"mt", "st", "ft", "mr", "mrs", "ms", "dr", "jr", "sr", "vs"}
+
+def find_sentence_end(text, start):
+    """Index just past the first sentence end in text[start:], or -1 if none yet."""
+    for match in SENTENCE_END.finditer(text, start):
+        words = text[start:match.start()].split()
+        word = words[-1].lstrip("\"'(").lower() if words else ""
+        # Skip known abbreviations and single-letter initials like "D.C." or "U.S."
+        initial = word.rsplit(".", 1)[-1]
+        if word in ABBREVIATIONS or (len(initial) == 1 and initial.isalpha()):
+            continue
+        return match.end()
+    return -1
 
 class GPTResponder:
     def __init__(self, api_key):
         self.client = openai.OpenAI(api_key=api_key)
+        self.cache = OrderedDict()
 
-    def get_response(self, user_question, weather_summary=None):
+    def cache_key(self, user_question, weather_summary):
+        # Ignore case, spacing and trailing punctuation from speech recognition
+        question = " ".join(user_question.lower().split()).rstrip("?.! ")
+        return question, weather_summary
+
+    def build_messages(self, user_question, weather_summary):
         weather_note = (
             f"The current weather is: {weather_summary}\n\n" if weather_summary else ""
         )
 
         prompt = (
-            f"You are a voice assistant. Your task is to answer user questions about places or regions.\n"
-            f"Always return your response in exactly this format:\n\n"
-            f"Location JSON:\n"
-            f"```json\n"
-            f"{{\n  \"type\": \"point\", \"lat\": ..., \"lon\": ..., \"color_rgb\": [R, G, B]\n}}\n"
-            f"or\n"
-            f"{{\n  \"type\": \"region\", \"polygon\": [[lat1, lon1], ...], \"color_rgb\": [R, G, B]\n}}\n"
-            f"```\n\n"
-            f"Answer:\n"
-            f"(write a short, friendly spoken response that includes weather if available)\n\n"
             f"{weather_note}"
             f"Now, answer this user question in that exact format:\n"
             f"{user_question}"
         )
 
-        response = self.client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        full_text = response.choices[0].message.content.strip()
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
 
-        json_match = re.search(r"Location JSON:\s*```json\s*(\{.*?\})\s*```", full_text, re.DOTALL)
-        answer_match = re.search(r"Answer:\s*(.+)", full_text, re.DOTALL)
+    def parse_location(self, text):
+        json_match = LOCATION_JSON_RE.search(text)
 
         location_data = {}
         if json_match:
@@ -45,6 +76,97 @@ class GPTResponder:
                 print("⚠️ Failed to parse JSON block.")
         else:
             print("⚠️ No Location JSON found.")
+        return location_data
+
+    def remember(self, key, spoken, location_data):
+        self.cache[key] = (spoken, location_data)
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def get_response(self, user_question, weather_summary=None):
+        key = self.cache_key(user_question, weather_summary)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            print("⚡ Using cached response.")
+            return self.cache[key]
+
+        response = self.client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=self.build_messages(user_question, weather_summary)
+        )
+
+        full_text = response.choices[0].message.content.strip()
+
+        location_data = self.parse_location(full_text)
+        answer_match = ANSWER_RE.search(full_text)
 
         spoken = answer_match.group(1).strip() if answer_match else "Sorry, I couldn't understand the location."
+
+        # Only remember answers that parsed cleanly
+        if location_data and answer_match:
+            self.remember(key, spoken, location_data)
+
         return spoken, location_data
+
+    def stream_response(self, user_question, weather_summary=None):
+        """
+        Streaming version of get_response, so speech can start while the
+        model is still generating.
+        Yields ("location", data) as soon as the Location JSON block is complete,
+        then ("sentence", text) for each finished sentence of the spoken answer.
+        """
+        key = self.cache_key(user_question, weather_summary)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            print("⚡ Using cached response.")
+            spoken, location_data = self.cache[key]
+            yield "location", location_data
+            yield "sentence", spoken
+            return
+
+        stream = self.client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=self.build_messages(user_question, weather_summary),
+            stream=True
+        )
+
+        full_text = ""
+        location_data = {}
+        answer_start = -1  # index just past "Answer:", once it has arrived
+        spoken_upto = 0    # index up to which sentences were already yielded
+
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            full_text += chunk.choices[0].delta.content
+
+            if answer_start < 0:
+                marker = full_text.find("Answer:")
+                if marker < 0:
+                    continue
+                # The JSON block comes before the answer, so it is complete by now
+                location_data = self.parse_location(full_text[:marker])
+                yield "location", location_data
+                answer_start = spoken_upto = marker + len("Answer:")
+
+            while True:
+                end = find_sentence_end(full_text, spoken_upto)
+                if end < 0:
+                    break
+                sentence = full_text[spoken_upto:end].strip()
+                spoken_upto = end
+                if sentence:
+                    yield "sentence", sentence
+
+        if answer_start < 0:
+            yield "location", self.parse_location(full_text)
+            yield "sentence", "Sorry, I couldn't understand the location."
+            return
+
+        rest = full_text[spoken_upto:].strip()
+        if rest:
+            yield "sentence", rest
+
+        spoken = full_text[answer_start:].strip()
+        if location_data and spoken:
+            self.remember(key, spoken, location_data)
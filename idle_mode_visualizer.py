@@ -2,47 +2,92 @@ import math
 import json
 import time
 import os
-import random
+import numpy as np
 from playsound import playsound
 import threading
 
 
 OUTPUT_FILE = "led_output.json"
+LIGHTNING_SOUND = "lightning.wav"
+
+WATER_COLOR = [0, 105, 148]  # water blue
+LAND_COLOR = [139, 69, 19]   # land brown
+
+# Altitude map colors, indexed by latitude band
+ALTITUDE_PALETTE = np.array([
+    [255, 0, 0],  # lat > 45
+    [0, 255, 0],  # 0 < lat <= 45
+    [0, 0, 255]   # lat <= 0
+])
 
 def write_led_output(data):
     with open(OUTPUT_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+        # Written every animation frame, so skip pretty-printing
+        json.dump(data, f, separators=(",", ":"))
     print(f"💾 Wrote {len(data['pixels'])} idle pixels to {OUTPUT_FILE}")
 
+def wait_for_next_frame(next_frame, frame_delay):
+    """
+    Sleep until the next frame deadline and return it. Deadlines advance by a
+    fixed period, so the time spent rendering a frame doesn't stretch the frame
+    rate; a frame that overruns moves the schedule forward instead of bursting.
+    """
+    now = time.monotonic()
+    next_frame = max(next_frame + frame_delay, now)
+    time.sleep(next_frame - now)
+    return next_frame
+
 
 class IdleModeVisualizer:
     def __init__(self, leds):
         self.leds = leds
         self.voice_interface = None  # will be set from run_idle_loop()
 
+        self._led_ids = [led["id"] for led in leds]
+
+        # Per-LED trig is fixed by the layout, so compute it once; animated
+        # frames then only need the sun's angles.
+        theta = np.array([led["theta"] for led in leds], dtype=np.float64)
+        phi = np.array([led["phi"] for led in leds], dtype=np.float64)
+        self._cos_theta, self._sin_theta = np.cos(theta), np.sin(theta)
+        self._cos_phi, self._sin_phi = np.cos(phi), np.sin(phi)
+
+        # Replace this with real map data later
+        self._is_water = phi > math.pi / 2  # crude placeholder
+
+        lat = 90 - np.degrees(phi)
+        self._altitude_band = np.where(lat > 45, 0, np.where(lat > 0, 1, 2))
+
+        # Crude fake storm zone: between phi=π/2 and 3π/2
+        self._storm_mask = (phi > math.pi / 2) & (phi < 3 * math.pi / 2)
+
     def generate_idle_map(self, color_func):
-        pixels = []
-        for led in self.leds:
-            theta = led["theta"]
-            phi = led["phi"]
-            color = color_func(theta, phi)
-            pixels.append({
-                "id": led["id"],
-                "theta": theta,
-                "phi": phi,
-                "color_rgb": color
-            })
+        return self.build_fullmap([color_func(led["theta"], led["phi"]) for led in self.leds])
+
+    def build_fullmap(self, colors):
+        # Only id + color per pixel: the geometry is fixed and already known from
+        # the layout, so it isn't repeated in every frame
+        pixels = [
+            {"id": led_id, "color_rgb": color}
+            for led_id, color in zip(self._led_ids, colors)
+        ]
         return {"type": "fullmap", "pixels": pixels}
 
-    def display_land_vs_water(self):
-        def is_water(theta, phi):
-            return phi > math.pi / 2  # crude fake logic
+    def sun_brightness(self, sun_theta, sun_phi):
+        """
+        cos(ϕ - sun_ϕ) * cos(θ - sun_θ) for every LED, expanded with the
+        angle-difference identity so no trig runs per LED.
+        """
+        cos_dphi = self._cos_phi * math.cos(sun_phi) + self._sin_phi * math.sin(sun_phi)
+        cos_dtheta = self._cos_theta * math.cos(sun_theta) + self._sin_theta * math.sin(sun_theta)
+        return cos_dphi * cos_dtheta
 
-        def color_func(theta, phi):
-            return [0, 105, 148] if is_water(theta, phi) else [139, 69, 19]
+    def land_water_colors(self):
+        return np.where(self._is_water[:, None], WATER_COLOR, LAND_COLOR)
 
+    def display_land_vs_water(self):
         print("🌊 Idle Mode: Land vs Water")
-        output = self.generate_idle_map(color_func)
+        output = self.build_fullmap(self.land_water_colors().tolist())
         write_led_output(output)
 
     def display_day_night(self, duration=30, step_seconds=1):
@@ -51,41 +96,34 @@ class IdleModeVisualizer:
             return math.radians(lon_deg), math.radians(90)
 
         print("🌗 Idle Mode: Animated Day/Night Terminator")
-        start_time = time.time()
-        while time.time() - start_time < duration:
-            elapsed = time.time() - start_time
+        start_time = time.monotonic()
+        while True:
+            elapsed = time.monotonic() - start_time
+            if elapsed >= duration:
+                break
             shift_deg = (elapsed / duration) * 360
 
             sun_theta, sun_phi = sun_direction(shift_deg)
 
-            def color_func(theta, phi):
-                brightness = math.cos(phi - sun_phi) * math.cos(theta - sun_theta)
-                return [255, 255, 200] if brightness > 0.5 else [10, 10, 40]
+            brightness = self.sun_brightness(sun_theta, sun_phi)[:, None]
+            colors = np.where(brightness > 0.5, [255, 255, 200], [10, 10, 40])
 
-            output = self.generate_idle_map(color_func)
+            output = self.build_fullmap(colors.tolist())
             write_led_output(output)
 
-            for _ in range(step_seconds):
-                if self.voice_interface:
-                    voice_input = self.voice_interface.listen(timeout=1)
-                    if voice_input and "smart globe" in voice_input.lower():
-                        print("🟢 Wake word detected (during animation).")
-                        self.voice_interface.speak("How can I help?")
-                        return self.voice_interface.listen(timeout=10)
-                time.sleep(1)
-
-    def display_altitude_map(self):
-        def color_func(theta, phi):
-            lat = 90 - math.degrees(phi)
-            if lat > 45:
-                return [255, 0, 0]
-            elif lat > 0:
-                return [0, 255, 0]
+            # A single listen covers the whole step; no deaf sleeps between 1 s listens
+            if self.voice_interface:
+                voice_input = self.voice_interface.listen(timeout=step_seconds)
+                if voice_input and "smart globe" in voice_input.lower():
+                    print("🟢 Wake word detected (during animation).")
+                    self.voice_interface.speak("How can I help?")
+                    return self.voice_interface.listen(timeout=10)
             else:
-                return [0, 0, 255]
+                time.sleep(step_seconds)
 
+    def display_altitude_map(self):
         print("🗻 Idle Mode: Altitude Map")
-        output = self.generate_idle_map(color_func)
+        output = self.build_fullmap(ALTITUDE_PALETTE[self._altitude_band].tolist())
         write_led_output(output)
 
     def display_day_night_animated(self, duration=30, frame_rate=5):
@@ -95,26 +133,28 @@ class IdleModeVisualizer:
         :param frame_rate: number of frames per second
         """
         print("🌍 Animated Day/Night Terminator Starting...")
-        start_time = time.time()
+        start_time = time.monotonic()
         total_frames = duration * frame_rate
         frame_delay = 1.0 / frame_rate
+        next_frame = start_time
 
-        while time.time() - start_time < duration:
-            elapsed = time.time() - start_time
+        while True:
+            elapsed = time.monotonic() - start_time
+            if elapsed >= duration:
+                break
             sun_lon_deg = ((elapsed / duration) * 360.0 - 180.0) % 360
             sun_phi = math.radians(sun_lon_deg)
             sun_theta = math.radians(90)  # Equator sun position
 
-            def color_func(theta, phi):
-                brightness = math.cos(phi - sun_phi) * math.cos(theta - sun_theta)
-                if brightness > 0.5:
-                    return [255, 255, 180]  # Day
-                elif brightness > 0:
-                    return [80, 80, 100]    # Twilight
-                else:
-                    return [10, 10, 40]     # Night
+            brightness = self.sun_brightness(sun_theta, sun_phi)[:, None]
+            colors = np.select(
+                [brightness > 0.5, brightness > 0],
+                [[255, 255, 180],  # Day
+                 [80, 80, 100]],   # Twilight
+                [10, 10, 40]       # Night
+            )
 
-            output = self.generate_idle_map(color_func)
+            output = self.build_fullmap(colors.tolist())
             write_led_output(output)
 
             # Check for wake word interrupt
@@ -125,7 +165,7 @@ class IdleModeVisualizer:
                     self.voice_interface.speak("How can I help?")
                     return self.voice_interface.listen(timeout=10)
 
-            time.sleep(frame_delay)
+            next_frame = wait_for_next_frame(next_frame, frame_delay)
     def display_land_vs_water_animated(self, duration=30, frame_rate=5):
         """
         Pulsing animation between land and water using brightness waves.
@@ -133,27 +173,23 @@ class IdleModeVisualizer:
         :param frame_rate: how many updates per second
         """
         print("🌊 Animated Land/Water Pulse Starting...")
-        start_time = time.time()
+        start_time = time.monotonic()
         frame_delay = 1.0 / frame_rate
+        next_frame = start_time
 
-        def is_water(theta, phi):
-            # Replace this with real map data later
-            return phi > math.pi / 2  # crude placeholder
+        # The land/water split doesn't change between frames, only the brightness does
+        base_colors = self.land_water_colors()
 
-        while time.time() - start_time < duration:
-            elapsed = time.time() - start_time
+        while True:
+            elapsed = time.monotonic() - start_time
+            if elapsed >= duration:
+                break
             wave = (math.sin(elapsed * math.pi * 2 / 5) + 1) / 2  # cycles every 5 seconds (0–1)
 
-            def color_func(theta, phi):
-                if is_water(theta, phi):
-                    base = [0, 105, 148]  # water blue
-                else:
-                    base = [139, 69, 19]  # land brown
-
-                # Apply wave brightness scaling
-                return [int(c * (0.5 + 0.5 * wave)) for c in base]
+            # Apply wave brightness scaling
+            colors = (base_colors * (0.5 + 0.5 * wave)).astype(int)
 
-            output = self.generate_idle_map(color_func)
+            output = self.build_fullmap(colors.tolist())
             write_led_output(output)
 
             # Wake word check
@@ -164,7 +200,7 @@ class IdleModeVisualizer:
                     self.voice_interface.speak("How can I help?")
                     return self.voice_interface.listen(timeout=10)
 
-            time.sleep(frame_delay)
+            next_frame = wait_for_next_frame(next_frame, frame_delay)
 
     
 
@@ -176,42 +212,29 @@ class IdleModeVisualizer:
         :param flash_probability: chance for each LED to flash per frame
         """
         print("⚡ Lightning Strike Animation Starting...")
-        start_time = time.time()
+        start_time = time.monotonic()
         frame_delay = 1.0 / frame_rate
+        next_frame = start_time
 
-        while time.time() - start_time < duration:
-            pixels = []
-
-            for led in self.leds:
-                theta = led["theta"]
-                phi = led["phi"]
-
-                # Crude fake storm zone: between phi=π/2 and 3π/2
-                in_storm_zone = math.pi/2 < phi < 3*math.pi/2
-
-                flash = in_storm_zone and random.random() < flash_probability
-                if flash:
-                    color = [255, 255, 255]  # Lightning white
-                    # ⚡ Sound cue (non-blocking)
-                    threading.Thread(target=playsound, args=("lightning.wav",), daemon=True).start()
-                else:
-                    color = [10, 10, 30]  # Night blue
-
+        thunder = None  # thread playing the current sound cue
 
-                pixels.append({
-                    "id": led["id"],
-                    "theta": theta,
-                    "phi": phi,
-                    "color_rgb": color
-                })
-
-            output = {
-                "type": "fullmap",
-                "pixels": pixels
-            }
+        while time.monotonic() - start_time < duration:
+            flashes = self._storm_mask & (np.random.random(len(self.leds)) < flash_probability)
+            colors = np.where(
+                flashes[:, None],
+                [255, 255, 255],  # Lightning white
+                [10, 10, 30]      # Night blue
+            )
+            any_flash = flashes.any()
 
+            output = self.build_fullmap(colors.tolist())
             write_led_output(output)
 
+            # ⚡ Sound cue (non-blocking): one per frame at most, and not over a cue still playing
+            if any_flash and not (thunder and thunder.is_alive()):
+                thunder = threading.Thread(target=playsound, args=(LIGHTNING_SOUND,), daemon=True)
+                thunder.start()
+
             # Wake word check
             if self.voice_interface:
                 voice_input = self.voice_interface.listen(timeout=0.1)
@@ -220,7 +243,7 @@ class IdleModeVisualizer:
                     self.voice_interface.speak("How can I help?")
                     return self.voice_interface.listen(timeout=10)
 
-            time.sleep(frame_delay)
+            next_frame = wait_for_next_frame(next_frame, frame_delay)
 
 
     def run_idle_loop(self, voice_interface):
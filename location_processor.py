@@ -1,19 +1,47 @@
 import math
 import json
 import os
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D  # Required for 3D plotting
+import numpy as np
 
 OUTPUT_FILE = "led_output.json"
+DEBUG = False  # print per-vertex conversions and show the 3D region plot
 
 def write_led_output(data):
     with open(OUTPUT_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-    print(f"💾 Wrote LED data to {OUTPUT_FILE}")
+        # Compact output: the Pi re-reads this file, nobody edits it by hand
+        json.dump(data, f, separators=(",", ":"))
+    if DEBUG:
+        print(f"💾 Wrote LED data to {OUTPUT_FILE}")
+
+def unit_vectors(theta, phi):
+    """Unit-sphere (x, y, z) rows for arrays of θ (polar) and ϕ (azimuth) angles."""
+    sin_theta = np.sin(theta)
+    return np.column_stack([sin_theta * np.cos(phi), sin_theta * np.sin(phi), np.cos(theta)])
+
+def rgb_from_color(color):
+    """`color` as a uint8 [R, G, B] clipped to 0–255, or None if it isn't three numbers."""
+    try:
+        rgb = np.asarray(color, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if rgb.shape != (3,) or not np.isfinite(rgb).all():
+        return None
+    return np.clip(rgb, 0, 255).astype(np.uint8)
 
 class LocationProcessor:
     def __init__(self, led_layout):
         self.leds = led_layout
+        # Struct-of-arrays copy of the layout for vectorized lookups;
+        # self.leds is kept for returning the original LED dicts
+        count = len(led_layout)
+        self._ids = np.fromiter((led["id"] for led in led_layout), dtype=np.int32, count=count)
+        self._theta = np.fromiter((led["theta"] for led in led_layout), dtype=np.float64, count=count)
+        self._phi = np.fromiter((led["phi"] for led in led_layout), dtype=np.float64, count=count)
+        # LEDs as unit vectors so distances follow the sphere instead of
+        # stretching near the poles and breaking at the ϕ seam; the largest
+        # dot product is the smallest angle.
+        # Built once; the LED layout never changes at runtime
+        self._xyz = unit_vectors(self._theta, self._phi)
 
     def spherical_from_latlon(self, lat, lon):
         phi = math.radians(lon)
@@ -22,72 +50,75 @@ class LocationProcessor:
 
     def debug_latlon_to_spherical(self, lat, lon):
         theta, phi = self.spherical_from_latlon(lat, lon)
+        if not DEBUG:
+            return theta, phi
         x = math.sin(theta) * math.cos(phi)
         y = math.sin(theta) * math.sin(phi)
         z = math.cos(theta)
         print(f"LAT={lat:.2f}, LON={lon:.2f} → θ={theta:.2f}, ϕ={phi:.2f} → x={x:.2f}, y={y:.2f}, z={z:.2f}")
         return theta, phi
 
+    def spherical_polygon_from_latlon(self, polygon):
+        """
+        Convert [[lat, lon], ...] to an (N, 2) array of [θ, ϕ] rows in one go.
+        Entries that aren't [lat, lon] pairs of numbers are skipped.
+        """
+        latlon = np.array(
+            [entry for entry in polygon if isinstance(entry, list) and len(entry) == 2],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        # A null lat/lon from GPT becomes NaN above; drop it like other malformed entries
+        latlon = latlon[np.isfinite(latlon).all(axis=1)]
+        return np.column_stack([np.radians(90 - latlon[:, 0]), np.radians(latlon[:, 1])])
+
     def find_closest_led(self, theta, phi):
-        min_dist = float("inf")
-        closest_led = None
-        for led in self.leds:
-            dtheta = theta - led["theta"]
-            dphi = phi - led["phi"]
-            dist = math.sqrt(dtheta**2 + dphi**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_led = led
-        return closest_led
+        i = np.argmax(self._xyz @ unit_vectors(theta, phi)[0])
+        return self.leds[i]
 
     def find_leds_in_region(self, polygon, radius=0.4):
-        led_ids = set()
-        for theta, phi in polygon:
-            for led in self.leds:
-                dtheta = theta - led["theta"]
-                dphi = phi - led["phi"]
-                dist = math.sqrt(dtheta**2 + dphi**2)
-                if dist < radius:
-                    led_ids.add(led["id"])
-        return sorted(list(led_ids))
+        """
+        IDs of all LEDs within `radius` (great-circle angle in radians) of
+        any polygon vertex.
+        """
+        if len(polygon) == 0:
+            return []
+        polygon = np.asarray(polygon, dtype=np.float64)
+        # Within `radius` of a vertex <=> dot product of the unit vectors >= cos(radius)
+        dots = unit_vectors(polygon[:, 0], polygon[:, 1]) @ self._xyz.T
+        near_any = (dots >= math.cos(radius)).any(axis=0)
+        return np.unique(self._ids[near_any]).tolist()
 
     def print_nearby_leds(self, lat, lon, max_dist=0.1):
         theta, phi = self.spherical_from_latlon(lat, lon)
         print(f"🔍 Nearby LEDs to θ={theta:.2f}, ϕ={phi:.2f} (from LAT={lat}, LON={lon})")
-        for led in self.leds:
-            dtheta = theta - led["theta"]
-            dphi = phi - led["phi"]
-            dist = math.sqrt(dtheta**2 + dphi**2)
-            if dist < max_dist:
-                print(f"  LED #{led['id']}: θ={led['theta']:.2f}, ϕ={led['phi']:.2f}, dist={dist:.3f}")
+        # Great-circle angle, the same metric find_closest_led uses
+        dots = self._xyz @ unit_vectors(theta, phi)[0]
+        dist = np.arccos(np.clip(dots, -1, 1))
+        for i in np.flatnonzero(dist < max_dist):
+            print(f"  LED #{self._ids[i]}: θ={self._theta[i]:.2f}, ϕ={self._phi[i]:.2f}, dist={dist[i]:.3f}")
 
     def plot_region_and_leds(self, spherical_polygon, lit_led_ids):
+        # Imported here so the assistant doesn't pay matplotlib's load time at startup
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D  # Required for 3D plotting
+
         fig = plt.figure()
         ax = fig.add_subplot(111, projection='3d')
 
-        # Plot all LEDs
-        for led in self.leds:
-            theta = led["theta"]
-            phi = led["phi"]
-            x = math.sin(theta) * math.cos(phi)
-            y = math.sin(theta) * math.sin(phi)
-            z = math.cos(theta)
-            is_lit = led["id"] in lit_led_ids
-
-            color = 'r' if is_lit else 'k'
-            size = 20 if is_lit else 5
-            ax.scatter(x, y, z, c=color, s=size)
+        # Plot all LEDs, one scatter call per group instead of one per LED
+        is_lit = np.isin(self._ids, list(lit_led_ids))
+        ax.scatter(*self._xyz[~is_lit].T, c='k', s=5)
+        ax.scatter(*self._xyz[is_lit].T, c='r', s=20)
 
-            # Label lit LEDs
-            if is_lit:
-                ax.text(x, y, z, str(led["id"]), color='red', fontsize=8)
+        # Label lit LEDs
+        for i in np.flatnonzero(is_lit):
+            x, y, z = self._xyz[i]
+            ax.text(x, y, z, str(self._ids[i]), color='red', fontsize=8)
 
         # Plot polygon vertices
-        for theta, phi in spherical_polygon:
-            x = math.sin(theta) * math.cos(phi)
-            y = math.sin(theta) * math.sin(phi)
-            z = math.cos(theta)
-            ax.plot([x], [y], [z], marker='o', color='blue', markersize=5)
+        if len(spherical_polygon):
+            poly = np.asarray(spherical_polygon, dtype=np.float64)
+            ax.plot(*unit_vectors(poly[:, 0], poly[:, 1]).T, linestyle='', marker='o', color='blue', markersize=5)
 
         ax.set_title("LED Globe - 3D View")
         ax.set_xlabel("X")
@@ -96,23 +127,33 @@ class LocationProcessor:
         ax.set_box_aspect([1, 1, 1])
         plt.show()
 
-    def process_location(self, location_data):
-        color = location_data.get("color_rgb", [255, 255, 255])
-        print(f"🎨 Color for highlight: RGB{tuple(color)}")
+    def region_led_ids(self, spherical_polygon):
+        # Step 1: Check which LEDs fall inside the polygon
+        inside = self.points_in_polygon(self._theta, self._phi, spherical_polygon)
+        region_leds = self._ids[inside].tolist()
+
+        # Step 2: Fallback to nearest LEDs if none found
+        if not region_leds:
+            print("⚠️ No LEDs found inside polygon. Finding closest fallback LEDs...")
 
-        # Radius scaling: LED sphere to globe radius
-        self.radius_scale = 135.8 / 168.3
+            center_theta, center_phi = spherical_polygon.mean(axis=0)
+            center_vec = unit_vectors(center_theta, center_phi)[0]
 
-        def spherical_to_cartesian(theta, phi):
-            r = self.radius_scale
-            x = r * math.sin(theta) * math.cos(phi)
-            y = r * math.sin(theta) * math.sin(phi)
-            z = r * math.cos(theta)
-            return (x, y, z)
+            # Largest dot product = smallest angle, so pick the top 5
+            # directly instead of acos + sorting every LED
+            dots = self._xyz @ center_vec
+            count = min(5, len(dots))
+            nearest = np.argpartition(-dots, count - 1)[:count]
+            nearest = nearest[np.argsort(-dots[nearest], kind="stable")]
+            region_leds = self._ids[nearest].tolist()
+            print(f"✅ Using fallback LEDs: {region_leds}")
 
-        def vector_distance(v1, v2):
-            dot = sum(a * b for a, b in zip(v1, v2))
-            return math.acos(max(-1.0, min(1.0, dot)))  # safe clamp
+        return region_leds
+
+    def process_location(self, location_data):
+        color = location_data.get("color_rgb", [255, 255, 255])
+        if DEBUG:
+            print(f"🎨 Color for highlight: RGB{tuple(color)}")
 
         if location_data.get("type") == "point":
             lat = location_data.get("lat")
@@ -133,50 +174,24 @@ class LocationProcessor:
 
         elif location_data.get("type") == "region":
             polygon = location_data.get("polygon")
-            spherical_polygon = []
-            if polygon:
-                print("📐 Lighting region polygon:")
-                for entry in polygon:
-                    if isinstance(entry, list) and len(entry) == 2:
-                        lat, lon = entry
-                        theta, phi = self.debug_latlon_to_spherical(lat, lon)
-                        spherical_polygon.append([theta, phi])
-
-                # Step 1: Check which LEDs fall inside the polygon
-                region_leds = [
-                    led["id"]
-                    for led in self.leds
-                    if self.point_in_polygon(led["theta"], led["phi"], spherical_polygon)
-                ]
-
-                # Step 2: Fallback to nearest LEDs if none found
-                if not region_leds:
-                    print("⚠️ No LEDs found inside polygon. Finding closest fallback LEDs...")
-
-                    center_theta = sum(p[0] for p in spherical_polygon) / len(spherical_polygon)
-                    center_phi = sum(p[1] for p in spherical_polygon) / len(spherical_polygon)
-                    center_vec = spherical_to_cartesian(center_theta, center_phi)
-
-                    sorted_leds = sorted(
-                        self.leds,
-                        key=lambda led: vector_distance(
-                            spherical_to_cartesian(led["theta"], led["phi"]),
-                            center_vec
-                        )
-                    )
-
-                    fallback_leds = sorted_leds[:5]
-                    region_leds = [led["id"] for led in fallback_leds]
-                    print(f"✅ Using fallback LEDs: {region_leds}")
+            spherical_polygon = self.spherical_polygon_from_latlon(polygon or [])
+            if len(spherical_polygon):
+                if DEBUG:
+                    print("📐 Lighting region polygon:")
+                    for theta, phi in spherical_polygon:
+                        print(f"  θ={theta:.2f}, ϕ={phi:.2f}")
+
+                region_leds = self.region_led_ids(spherical_polygon)
 
                 processed = {
                     "type": "region",
-                    "polygon": spherical_polygon,
+                    "polygon": spherical_polygon.tolist(),
                     "color_rgb": color,
                     "led_ids": region_leds
                 }
 
-                self.plot_region_and_leds(spherical_polygon, region_leds)
+                if DEBUG:
+                    self.plot_region_and_leds(spherical_polygon, region_leds)
                 write_led_output(processed)
                 return processed
 
@@ -184,6 +199,55 @@ class LocationProcessor:
         write_led_output({"type": "none"})
         return None
 
+    def process_locations(self, batch):
+        """
+        Light several locations at once and write them as a single fullmap frame.
+        All points are matched with one matrix product; regions are drawn first,
+        so points stay visible on top of them.
+        :param batch: list of location dicts, as accepted by process_location
+        :return: the fullmap that was written
+        """
+        colors = np.zeros((len(self.leds), 3), dtype=np.uint8)
+        lit = np.zeros(len(self.leds), dtype=bool)
+
+        # GPT supplies the colors, so skip entries whose color isn't a usable RGB triple
+        for location in batch:
+            if location.get("type") != "region":
+                continue
+            rgb = rgb_from_color(location.get("color_rgb", [255, 255, 255]))
+            if rgb is None:
+                continue
+            spherical_polygon = self.spherical_polygon_from_latlon(location.get("polygon") or [])
+            if len(spherical_polygon):
+                in_region = np.isin(self._ids, self.region_led_ids(spherical_polygon))
+                colors[in_region] = rgb
+                lit |= in_region
+
+        points, point_colors = [], []
+        for location in batch:
+            if location.get("type") != "point" or location.get("lat") is None or location.get("lon") is None:
+                continue
+            rgb = rgb_from_color(location.get("color_rgb", [255, 255, 255]))
+            if rgb is not None:
+                points.append(location)
+                point_colors.append(rgb)
+        if points:
+            lat = np.array([location["lat"] for location in points], dtype=np.float64)
+            lon = np.array([location["lon"] for location in points], dtype=np.float64)
+            dots = unit_vectors(np.radians(90 - lat), np.radians(lon)) @ self._xyz.T
+            nearest = np.argmax(dots, axis=1)
+            colors[nearest] = point_colors
+            lit[nearest] = True
+
+        pixels = [
+            {"id": led_id, "color_rgb": color}
+            for led_id, color in zip(self._ids[lit].tolist(), colors[lit].tolist())
+        ]
+        output = {"type": "fullmap", "pixels": pixels}
+        print(f"🗺️ Lighting {len(pixels)} LEDs for {len(batch)} locations")
+        write_led_output(output)
+        return output
+
 
     def point_in_polygon(self, x, y, poly):
         """
@@ -202,3 +266,20 @@ class LocationProcessor:
                 inside = not inside
             j = i
         return inside
+
+    def points_in_polygon(self, xs, ys, poly):
+        """
+        Vectorized point_in_polygon: ray-casts every (x, y) pair against every
+        edge at once and returns a boolean mask. Edge slopes are computed once
+        per polygon instead of once per point.
+        """
+        poly = np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+        xi, yi = poly[:, 0], poly[:, 1]
+        # Edge i runs from vertex i-1 to vertex i, as in point_in_polygon
+        xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+        slope = (xj - xi) / (yj - yi + 1e-10)
+
+        xs = np.asarray(xs)[:, None]
+        ys = np.asarray(ys)[:, None]
+        crossings = ((yi > ys) != (yj > ys)) & (xs < slope * (ys - yi) + xi)
+        return np.count_nonzero(crossings, axis=1) % 2 == 1
@@ -1,4 +1,5 @@
 import serial
+import struct
 import time
 
 PORT = '/dev/ttyAMA0'
@@ -9,20 +10,22 @@ DELAY = 0.1  # Safe delay
 ser = serial.Serial(PORT, BAUD)
 time.sleep(2)
 
-def send_frame():
-    frame = bytearray()
+GREEN_LEDS = 46  # first LEDs lit green, the rest blue
+
+def build_frame():
     # Frame header: [0xAA, 0x55, high_byte, low_byte]
     payload_len = NUM_LEDS * 3  # 1227
-    frame.extend([0xAA, 0x55, (payload_len >> 8) & 0xFF, payload_len & 0xFF])
+    header = struct.pack(">BBH", 0xAA, 0x55, payload_len)
 
-    for i in range(NUM_LEDS):
-        if i < 46:
-            r, g, b = 0, 55, 0  # Green
-        else:
-            r, g, b = 0, 0, 55  # Blue
-        frame.extend([r, g, b])
+    green = bytes([0, 55, 0]) * GREEN_LEDS
+    blue = bytes([0, 0, 55]) * (NUM_LEDS - GREEN_LEDS)
+    return header + green + blue
 
-    ser.write(frame)
+# The test pattern never changes, so build it once and resend the same bytes
+FRAME = build_frame()
+
+def send_frame():
+    ser.write(FRAME)
 
 while True:
     send_frame()
@@ -1,7 +1,7 @@
 import serial
+import struct
 import time
 import json
-import os
 
 PORT = '/dev/ttyAMA0'
 BAUD = 115200
@@ -9,37 +9,45 @@ NUM_LEDS = 402
 JSON_PATH = 'led_output.json'
 REFRESH_DELAY = 0.05  # seconds between updates
 
-def load_led_data():
-    if not os.path.exists(JSON_PATH):
-        return [(0, 0, 0)] * NUM_LEDS  # fallback to all off
+PAYLOAD_LEN = NUM_LEDS * 3
+ALL_OFF = bytes(PAYLOAD_LEN)
 
+# One persistent frame: header written once, RGB payload overwritten in place
+# Frame header: [0xAA, 0x55, high_byte, low_byte]
+HEADER = struct.pack(">BBH", 0xAA, 0x55, PAYLOAD_LEN)
+FRAME = bytearray(HEADER) + bytearray(PAYLOAD_LEN)
+PAYLOAD = memoryview(FRAME)[len(HEADER):]
+
+def read_led_file(path):
     try:
-        with open(JSON_PATH, 'r') as f:
-            data = json.load(f)
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def load_led_data(payload, raw):
+    payload[:] = ALL_OFF  # fallback to all off
+
+    if raw is None:
+        return
+
+    try:
+        data = json.loads(raw)
 
         if data.get("type") != "fullmap":
-            return [(0, 0, 0)] * NUM_LEDS  # not a full frame
+            return  # not a full frame
 
-        color_map = [(0, 0, 0)] * NUM_LEDS
         for pixel in data["pixels"]:
             idx = pixel["id"]
             rgb = pixel.get("color_rgb", [0, 0, 0])
-            if 0 <= idx < NUM_LEDS:
-                color_map[idx] = tuple(rgb)
-        return color_map
+            if 0 <= idx < NUM_LEDS and len(rgb) == 3:
+                payload[idx * 3:idx * 3 + 3] = bytes(rgb)
     except Exception as e:
         print(f"⚠️ Failed to read LED data: {e}")
-        return [(0, 0, 0)] * NUM_LEDS
-
-def send_frame(ser, color_map):
-    payload_len = NUM_LEDS * 3
-    frame = bytearray()
-    frame.extend([0xAA, 0x55, (payload_len >> 8) & 0xFF, payload_len & 0xFF])
-
-    for r, g, b in color_map:
-        frame.extend([r, g, b])
+        payload[:] = ALL_OFF
 
-    ser.write(frame)
+def send_frame(ser):
+    ser.write(FRAME)
 
 def main():
     print(f"📡 Opening serial port {PORT} at {BAUD}...")
@@ -47,9 +55,16 @@ def main():
     time.sleep(2)  # Allow serial to stabilize
 
     print("🎛️ Starting LED output loop...")
+    last_raw = None
     while True:
-        color_map = load_led_data()
-        send_frame(ser, color_map)
+        # Only re-parse the JSON when its bytes changed; otherwise keep resending
+        # the frame already in the buffer. Comparing contents rather than mtimes
+        # also catches same-size rewrites on synced files with coarse timestamps
+        raw = read_led_file(JSON_PATH)
+        if raw != last_raw:
+            load_led_data(PAYLOAD, raw)
+            last_raw = raw
+        send_frame(ser)
         time.sleep(REFRESH_DELAY)
 
 if __name__ == "__main__":
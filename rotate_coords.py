@@ -1,43 +1,46 @@
 import json
-import math
+import numpy as np
 
 INPUT_FILE = "coordinates.json"
 OUTPUT_FILE = "coordinates_rotated.json"
 
-def spherical_to_cartesian(r, theta_deg, phi_deg):
-    theta = math.radians(theta_deg)
-    phi = math.radians(phi_deg)
-    x = r * math.sin(phi) * math.cos(theta)
-    y = r * math.sin(phi) * math.sin(theta)
-    z = r * math.cos(phi)
-    return x, y, z
-
-def cartesian_to_spherical(x, y, z):
-    r = math.sqrt(x**2 + y**2 + z**2)
-    theta = math.degrees(math.atan2(y, x)) % 360
-    phi = math.degrees(math.acos(z / r)) if r != 0 else 0
-    return r, theta, phi
+# Rotate 90° around X axis: (x, y, z) -> (x, z, -y)
+ROTATION = np.array([
+    [1, 0, 0],
+    [0, 0, 1],
+    [0, -1, 0]
+], dtype=np.float64)
+
+def spherical_to_cartesian(theta_deg, phi_deg):
+    """(N, 3) unit vectors, one row per point."""
+    theta = np.radians(theta_deg)
+    phi = np.radians(phi_deg)
+    sin_phi = np.sin(phi)
+    return np.column_stack([sin_phi * np.cos(theta), sin_phi * np.sin(theta), np.cos(phi)])
+
+def cartesian_to_spherical(points):
+    # Rows are unit vectors, so no division by r is needed
+    theta = np.degrees(np.arctan2(points[:, 1], points[:, 0])) % 360
+    phi = np.degrees(np.arccos(np.clip(points[:, 2], -1, 1)))
+    return theta, phi
 
 with open(INPUT_FILE, "r") as f:
     coords = json.load(f)
 
-rotated = []
-for entry in coords:
-    theta, phi = entry["theta"], entry["phi"]
-    r = 1  # radius is ignored, use unit sphere
-    x, y, z = spherical_to_cartesian(r, theta, phi)
-
-    # Rotate 90° around X axis
-    y_new = z
-    z_new = -y
-
-    _, theta_new, phi_new = cartesian_to_spherical(x, y_new, z_new)
+# Work on whole arrays instead of one entry at a time
+theta = np.array([entry["theta"] for entry in coords], dtype=np.float64)
+phi = np.array([entry["phi"] for entry in coords], dtype=np.float64)
+points = spherical_to_cartesian(theta, phi)  # radius is ignored, use unit sphere
+theta_new, phi_new = cartesian_to_spherical(points @ ROTATION.T)
 
-    rotated.append({
+rotated = [
+    {
         "id": entry["id"],
-        "theta": round(theta_new, 2),
-        "phi": round(phi_new, 2)
-    })
+        "theta": round(t, 2),
+        "phi": round(p, 2)
+    }
+    for entry, t, p in zip(coords, theta_new.tolist(), phi_new.tolist())
+]
 
 with open(OUTPUT_FILE, "w") as f:
     json.dump(rotated, f, indent=2)
@@ -3,15 +3,21 @@ import math
 def spherical_to_cartesian(r, theta_deg, phi_deg):
     theta = math.radians(theta_deg)
     phi = math.radians(phi_deg)
-    x = r * math.sin(phi) * math.cos(theta)
-    y = r * math.sin(phi) * math.sin(theta)
+    # Each sine/cosine is needed once, so compute them up front
+    sin_phi = math.sin(phi)
+    x = r * sin_phi * math.cos(theta)
+    y = r * sin_phi * math.sin(theta)
     z = r * math.cos(phi)
     return x, y, z
 
 def cartesian_to_spherical(x, y, z):
-    r = math.sqrt(x**2 + y**2 + z**2)
+    r = math.hypot(x, y, z)
     theta = math.degrees(math.atan2(y, x)) % 360
-    phi = math.degrees(math.acos(z / r)) if r != 0 else 0
+    if r == 0:
+        phi = 0
+    else:
+        # Clamp against rounding just past ±1 for points on the unit sphere
+        phi = math.degrees(math.acos(max(-1.0, min(1.0, z / r))))
     return r, theta, phi
 
 # Input from user
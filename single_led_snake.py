@@ -1,7 +1,9 @@
 import serial
+import struct
 import time
 import sys
-import select
+import os
+import selectors
 import tty
 import termios
 import argparse
@@ -22,28 +24,41 @@ snake_start = args.start % NUM_LEDS
 ser = serial.Serial(PORT, BAUD)
 time.sleep(2)
 
-def send_frame():
-    frame = bytearray()
-    payload_len = NUM_LEDS * 3
-    frame.extend([0xAA, 0x55, (payload_len >> 8) & 0xFF, payload_len & 0xFF])
+PAYLOAD_LEN = NUM_LEDS * 3
+BACKGROUND = bytes([0, 0, 3]) * NUM_LEDS
+SNAKE = bytes([255, 0, 0]) * SNAKE_LENGTH
+TRAIL = BACKGROUND[:len(SNAKE)]  # background bytes to erase the snake with
 
-    for i in range(NUM_LEDS):
-        in_snake = (snake_start <= i < snake_start + SNAKE_LENGTH) or \
-                   (snake_start + SNAKE_LENGTH > NUM_LEDS and i < (snake_start + SNAKE_LENGTH) % NUM_LEDS)
+# One persistent frame: header and background written once
+# Frame header: [0xAA, 0x55, high_byte, low_byte]
+HEADER = struct.pack(">BBH", 0xAA, 0x55, PAYLOAD_LEN)
+FRAME = bytearray(HEADER) + BACKGROUND
+PAYLOAD = memoryview(FRAME)[len(HEADER):]
+drawn_start = None  # where the snake currently is in FRAME
 
-        if in_snake:
-            r, g, b = 255, 0, 0
-        else:
-            r, g, b = 0, 0, 3
+def paint(start, pattern):
+    # Write SNAKE_LENGTH LEDs' worth of RGB bytes starting at LED `start`
+    start *= 3
+    end = start + len(pattern)
+    if end <= PAYLOAD_LEN:
+        PAYLOAD[start:end] = pattern
+    else:
+        # Snake wraps around
+        split = PAYLOAD_LEN - start
+        PAYLOAD[start:] = pattern[:split]
+        PAYLOAD[:end - PAYLOAD_LEN] = pattern[split:]
 
-        frame.extend([r, g, b])
+def send_frame():
+    global drawn_start
+    # Only the LEDs under the old and new snake change between frames
+    if drawn_start is not None:
+        paint(drawn_start, TRAIL)
+    paint(snake_start, SNAKE)
+    drawn_start = snake_start
 
-    ser.write(frame)
+    ser.write(FRAME)
     print(f"Snake starts at LED index: {snake_start}")
 
-def key_pressed():
-    return select.select([sys.stdin], [], [], 0)[0]
-
 # Save terminal settings
 fd = sys.stdin.fileno()
 old_settings = termios.tcgetattr(fd)
@@ -52,9 +67,18 @@ try:
     tty.setcbreak(fd)
     print("Press 'd' to move forward, 'a' to move backward. Ctrl+C to quit.")
 
+    # Sleep until a key arrives instead of polling stdin in a busy loop
+    selector = selectors.DefaultSelector()
+    selector.register(sys.stdin, selectors.EVENT_READ)
+
     while True:
-        if key_pressed():
-            key = sys.stdin.read(1)
+        selector.select()
+        # Read straight from the fd: keys left in sys.stdin's buffer would not
+        # wake the selector again
+        keys = os.read(fd, 64)
+        if not keys:
+            break  # stdin closed; select() would return immediately forever
+        for key in keys.decode(errors="ignore"):
             if key == 'd':
                 snake_start = (snake_start + 1) % NUM_LEDS
                 send_frame()
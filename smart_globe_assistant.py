@@ -20,6 +20,12 @@ class SmartGlobeAssistant:
         self.visualizer = IdleModeVisualizer(leds)
 
     def run(self):
+        try:
+            self.conversation_loop()
+        finally:
+            self.voice.close()
+
+    def conversation_loop(self):
         while True:
             user_input = self.voice.listen(timeout=10)
 
@@ -35,12 +41,17 @@ class SmartGlobeAssistant:
                 self.voice.speak(user_input)
                 continue
 
-            spoken_response, location_data = self.gpt.get_response(user_input)
-
-            if location_data:
-                result = self.processor.process_location(location_data)
-                print("📡 Processed location data:")
-                print(json.dumps(result, indent=2))
-
-            print(spoken_response)
-            self.voice.speak(spoken_response)
+            # Queue each sentence as soon as GPT finishes it; speech plays on
+            # the voice thread while the rest of the answer is still generating
+            for kind, value in self.gpt.stream_response(user_input):
+                if kind == "location":
+                    if value:
+                        result = self.processor.process_location(value)
+                        print("📡 Processed location data:")
+                        print(json.dumps(result, indent=2))
+                else:
+                    print(value)
+                    self.voice.queue_speech(value)
+
+            # Don't start listening while the globe is still talking
+            self.voice.wait_for_speech()
@@ -1,4 +1,5 @@
 import serial
+import struct
 import time
 
 PORT = '/dev/ttyAMA0'
@@ -12,26 +13,39 @@ time.sleep(2)
 snake_start = 0
 SNAKE_LENGTH = 20
 
-def send_frame():
-    global snake_start
-    frame = bytearray()
-    # Frame header: [0xAA, 0x55, high_byte, low_byte]
-    payload_len = NUM_LEDS * 3  # 1227
-    frame.extend([0xAA, 0x55, (payload_len >> 8) & 0xFF, payload_len & 0xFF])
-
-    for i in range(NUM_LEDS):
+PAYLOAD_LEN = NUM_LEDS * 3  # 1227
+BACKGROUND = bytes([0, 0, 6]) * NUM_LEDS  # Blue background
+SNAKE = bytes([100, 0, 0]) * SNAKE_LENGTH  # Red snake
+TRAIL = BACKGROUND[:len(SNAKE)]  # background bytes to erase the snake with
+
+# One persistent frame: header and background written once
+# Frame header: [0xAA, 0x55, high_byte, low_byte]
+HEADER = struct.pack(">BBH", 0xAA, 0x55, PAYLOAD_LEN)
+FRAME = bytearray(HEADER) + BACKGROUND
+PAYLOAD = memoryview(FRAME)[len(HEADER):]
+drawn_start = None  # where the snake currently is in FRAME
+
+def paint(start, pattern):
+    # Write SNAKE_LENGTH LEDs' worth of RGB bytes starting at LED `start`
+    start *= 3
+    end = start + len(pattern)
+    if end <= PAYLOAD_LEN:
+        PAYLOAD[start:end] = pattern
+    else:
         # Snake wraps around
-        in_snake = (snake_start <= i < snake_start + SNAKE_LENGTH) or \
-                   (snake_start + SNAKE_LENGTH > NUM_LEDS and i < (snake_start + SNAKE_LENGTH) % NUM_LEDS)
-
-        if in_snake:
-            r, g, b = 100, 0, 0  # Red snake
-        else:
-            r, g, b = 0, 0, 6  # Blue background
+        split = PAYLOAD_LEN - start
+        PAYLOAD[start:] = pattern[:split]
+        PAYLOAD[:end - PAYLOAD_LEN] = pattern[split:]
 
-        frame.extend([r, g, b])
-
-    ser.write(frame)
+def send_frame():
+    global snake_start, drawn_start
+    # Only the LEDs under the old and new snake change between frames
+    if drawn_start is not None:
+        paint(drawn_start, TRAIL)
+    paint(snake_start, SNAKE)
+    drawn_start = snake_start
+
+    ser.write(FRAME)
     snake_start = (snake_start + 4) % NUM_LEDS
 
 while True:
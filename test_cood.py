@@ -1,32 +1,33 @@
 import json
-import math
+import numpy as np
 import plotly.graph_objects as go
 
+LABEL_LIMIT = 1000  # above this many points, skip the per-point text labels
+
 def spherical_to_xyz(theta_deg, phi_deg):
-    theta = math.radians(theta_deg)
-    phi = math.radians(phi_deg)
-    x = math.sin(theta) * math.cos(phi)
-    y = math.sin(theta) * math.sin(phi)
-    z = math.cos(theta)
+    theta = np.radians(theta_deg)
+    phi = np.radians(phi_deg)
+    x = np.sin(theta) * np.cos(phi)
+    y = np.sin(theta) * np.sin(phi)
+    z = np.cos(theta)
     return x, y, z
 
 # Load coordinates
 with open("coordinates_shifted_2.json") as f:
     coordinates = json.load(f)
 
-x_vals, y_vals, z_vals, labels = [], [], [], []
-for point in coordinates:
-    x, y, z = spherical_to_xyz(point["theta"], point["phi"])
-    x_vals.append(x)
-    y_vals.append(y)
-    z_vals.append(z)
-    labels.append(str(point["id"]))
+# Project every point at once; plotly takes the arrays as they are
+theta = np.array([point["theta"] for point in coordinates], dtype=np.float64)
+phi = np.array([point["phi"] for point in coordinates], dtype=np.float64)
+x_vals, y_vals, z_vals = spherical_to_xyz(theta, phi)
+labels = [str(point["id"]) for point in coordinates]
+show_labels = len(coordinates) <= LABEL_LIMIT
 
 # Create interactive plot
 fig = go.Figure(data=[
     go.Scatter3d(
         x=x_vals, y=y_vals, z=z_vals,
-        mode='markers+text',
+        mode='markers+text' if show_labels else 'markers',
         marker=dict(size=3, color='blue'),
         text=labels,
         textposition='top center',
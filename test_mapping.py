@@ -1,4 +1,5 @@
 import serial
+import struct
 import time
 import json
 
@@ -16,30 +17,28 @@ time.sleep(2)  # allow serial to stabilize
 with open(JSON_PATH, 'r') as f:
     coordinates = json.load(f)
 
-# Map from LED ID to its color based on phi
-def build_color_map():
-    color_map = [(0, 0, 0)] * NUM_LEDS  # default off
+BLUE = bytes([0, 0, 55])
+RED = bytes([55, 0, 0])
+
+# Color each LED by theta, straight into the frame payload
+def build_frame():
+    payload_len = NUM_LEDS * 3
+    # Frame header: [0xAA, 0x55, high_byte, low_byte]
+    header = struct.pack(">BBH", 0xAA, 0x55, payload_len)
+    frame = bytearray(header) + bytes(payload_len)  # default off
+
     for coord in coordinates:
         idx = coord["id"]
-        phi = coord["phi"]
-        theta = coord["theta"]
         if 0 <= idx < NUM_LEDS:
-            if theta < 180:
-                color_map[idx] = (0, 0, 55)  # blue
-            else:
-                color_map[idx] = (55, 0, 0)  # red
-    return color_map
+            start = len(header) + idx * 3
+            frame[start:start + 3] = BLUE if coord["theta"] < 180 else RED
+    return bytes(frame)
 
-def send_frame():
-    frame = bytearray()
-    payload_len = NUM_LEDS * 3
-    frame.extend([0xAA, 0x55, (payload_len >> 8) & 0xFF, payload_len & 0xFF])
-
-    color_map = build_color_map()
-    for r, g, b in color_map:
-        frame.extend([r, g, b])
+# The coordinates don't change while running, so build the frame once
+FRAME = build_frame()
 
-    ser.write(frame)
+def send_frame():
+    ser.write(FRAME)
 
 # Main loop
 while True:
@@ -1,24 +1,92 @@
+import sys
+import time
+import queue
+import threading
 import pyttsx3
 import speech_recognition as sr
 
+RECALIBRATE_SECONDS = 300  # re-measure ambient noise every 5 minutes
+
 class VoiceInterface:
     def __init__(self):
-        self.engine = pyttsx3.init()
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
+        self.source = None         # microphone stream, opened once and kept open
+        self.calibrated_at = None  # time.monotonic() of the last noise calibration
+
+        # All speech goes through one worker thread, so callers can queue the
+        # next sentence while the current one is still playing
+        self.speech_queue = queue.Queue()
+        threading.Thread(target=self._speech_worker, daemon=True).start()
+
+    def close(self):
+        if self.source is not None:
+            self.microphone.__exit__(None, None, None)
+            self.source = None
+
+    def discard_buffered_audio(self):
+        # The open stream keeps recording between listens, including the globe's
+        # own speech, so drop that backlog before listening for the user again
+        stream = self.source.stream.pyaudio_stream
+        available = stream.get_read_available()
+        if available > 0:
+            stream.read(available, exception_on_overflow=False)
+
+    def _speech_worker(self):
+        # pyttsx3 drivers must be driven from the thread that created them,
+        # so the engine lives entirely on this thread
+        if sys.platform == "win32":
+            import comtypes  # SAPI5 needs COM initialised on this thread
+            comtypes.CoInitialize()
+        try:
+            engine = pyttsx3.init()
+        except Exception as e:
+            print(f"⚠️ Text-to-speech unavailable: {e}")
+            engine = None
+
+        while True:
+            text = self.speech_queue.get()
+            try:
+                if engine is not None:
+                    engine.say(text)
+                    engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️ Text-to-speech failed: {e}")
+            finally:
+                self.speech_queue.task_done()
+
+    def queue_speech(self, text):
+        """Start speaking `text` after anything already queued, without waiting."""
+        self.speech_queue.put(text)
+
+    def wait_for_speech(self):
+        """Block until everything queued has been spoken."""
+        self.speech_queue.join()
 
     def speak(self, text):
-        self.engine.say(text)
-        self.engine.runAndWait()
+        self.queue_speech(text)
+        self.wait_for_speech()
 
     def listen(self, timeout=10):
-        with self.microphone as source:
-            print("Listening...")
-            self.recognizer.adjust_for_ambient_noise(source)
-            try:
-                audio = self.recognizer.listen(source, timeout=timeout)
-            except sr.WaitTimeoutError:
-                return None
+        # The idle animations listen several times a second, so reopening the
+        # audio stream for every call adds up; open it once instead
+        if self.source is None:
+            self.source = self.microphone.__enter__()
+        else:
+            self.discard_buffered_audio()
+        source = self.source
+
+        print("Listening...")
+        # Calibration records audio, so only redo it every few minutes; the
+        # recognizer's dynamic energy threshold keeps adapting in between
+        now = time.monotonic()
+        if self.calibrated_at is None or now - self.calibrated_at > RECALIBRATE_SECONDS:
+            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            self.calibrated_at = now
+        try:
+            audio = self.recognizer.listen(source, timeout=timeout)
+        except sr.WaitTimeoutError:
+            return None
         try:
             print("Recognizing...")
             return self.recognizer.recognize_google(audio)